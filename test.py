@@ -1,174 +1,643 @@
+import argparse
+import asyncio
+import collections
+import errno
+import itertools
 import json
+import logging
+import operator
+import os
 import re
+import selectors
+import shutil
+import signal
+import subprocess
 import sys
 import threading
 import socket
 import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from dataclasses import dataclass
 import pingparsing
 from PyQt6 import sip
-from PyQt6.QtCore import Qt, pyqtSignal, QObject, QThread, QTimer
+from PyQt6.QtCore import (
+    Qt, pyqtSignal, QObject, QThread, QTimer, QAbstractTableModel, QModelIndex
+)
 from PyQt6.QtGui import QIcon, QFont, QColor, QValidator
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QLabel, QLineEdit, QPushButton, QProgressBar,
-    QGroupBox, QMessageBox, QFileDialog, QTableWidget,
-    QHeaderView, QTableWidgetItem, QTabWidget, QSpacerItem, QSizePolicy
+    QGroupBox, QMessageBox, QFileDialog, QTableView,
+    QHeaderView, QTabWidget, QSpacerItem, QSizePolicy
+)
+
+try:
+    import icmplib  # 进程内ICMP，无需为每个目标启动ping子进程
+except ImportError:
+    icmplib = None
+
+try:
+    import orjson  # 导出JSON时比标准库json快，未安装时退回json
+except ImportError:
+    orjson = None
+
+# 调试日志默认关闭，运行时加 --debug 开启
+logger = logging.getLogger("nettool")
+logger.setLevel(logging.WARNING)
+
+
+def _icmplib_usable():
+    """探测能否创建非特权ICMP socket
+
+    装了icmplib不代表能用：Linux默认net.ipv4.ping_group_range = "1 0"，
+    即使root也会抛SocketPermissionError，此时要退回fping或系统ping。
+    """
+    if icmplib is None:
+        return False
+    try:
+        icmplib.ICMPv4Socket(privileged=False).close()
+    except Exception:
+        return False
+    return True
+
+
+# 启动时探测一次，可用时才走icmplib
+_ICMPLIB_USABLE = _icmplib_usable()
+
+# icmplib不可用时优先用fping一次性ping所有目标（Windows上通常没有，退回pingparsing）
+_FPING_PATH = shutil.which("fping")
+
+# 非阻塞connect_ex的返回值：连接仍在进行 / 连接被拒绝（Windows上为WSA错误码）
+# POSIX上EWOULDBLOCK即EAGAIN，表示本地端口耗尽、连接并未发起，不能算作进行中
+_CONNECT_PENDING = {0, errno.EINPROGRESS, errno.EALREADY}
+if sys.platform == "win32":
+    _CONNECT_PENDING.add(errno.WSAEWOULDBLOCK)
+_CONNECT_REFUSED = {errno.ECONNREFUSED, getattr(errno, "WSAECONNREFUSED", errno.ECONNREFUSED)}
+
+# IPv4地址（点分十进制）
+_IPV4_RE = re.compile(
+    r'^((25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)\.){3}(25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)$'
+)
+
+# 目标地址分词：逗号（含全角）、分号、空白均视为分隔符
+_TARGET_RE = re.compile(r'[^,，;\s]+')
+
+# fping -q 的汇总行，例如：
+#   10.0.0.1 : xmt/rcv/%loss = 4/4/0%, min/avg/max = 0.03/0.05/0.07
+#   10.0.0.2 : xmt/rcv/%loss = 4/0/100%
+_FPING_RE = re.compile(
+    r'^(?P<host>\S+)\s*:\s*xmt/rcv/%loss = \d+/\d+/(?P<loss>[\d.]+)%'
+    r'(?:, min/avg/max = [\d.]+/(?P<avg>[\d.]+)/[\d.]+)?'
 )
 
+# pingparsing解析器：构造时会编译大量正则，parse()无状态，全局只建一个
+_PING_PARSER = pingparsing.PingParsing()
+
+
+@dataclass(slots=True)
+class PingResult:
+    """单个目标的Ping结果"""
+    target: str
+    latency: float | None = None  # 平均延迟(ms)，无响应时为None
+    loss: float | None = None  # 丢包率(%)
+    error: str | None = None
+
+
+@dataclass(slots=True)
+class PortResult:
+    """单个目标的端口测试结果"""
+    target: str
+    port: int
+    status: bool
+    msg: str
+    response_time: float | None = None  # 连接耗时(ms)
+
+
+class DNSCache:
+    """域名解析缓存：每个域名只解析一次，TTL内直接复用结果"""
+
+    def __init__(self, ttl=900, max_workers=10):
+        self.ttl = ttl
+        self._cache = {}  # 域名 -> (IP或解析中的Future, 过期时间)
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._closed = threading.Event()
+
+    def prefetch(self, hosts):
+        """并发解析一批域名，不阻塞调用方"""
+        for host in hosts:
+            self._lookup(host)
+
+    def resolve(self, host):
+        """返回域名对应的IP，正在解析时等待结果
+
+        等待期间定期检查是否已shutdown：正在执行的getaddrinfo无法取消，
+        但调用方（扫描线程）不必跟着等到解析超时。
+        """
+        value = self._lookup(host)
+        if not isinstance(value, Future):
+            return value
+        while True:
+            try:
+                return value.result(timeout=0.2)
+            except FutureTimeoutError:
+                if self._closed.is_set():
+                    raise RuntimeError("域名解析已取消")
+
+    def shutdown(self):
+        """取消尚未开始的解析任务，并让正在等待解析结果的调用方返回"""
+        self._closed.set()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _lookup(self, host):
+        """查询缓存，未命中时放入占位Future，避免同一域名重复解析"""
+        if _IPV4_RE.match(host):
+            return host  # IP地址无需解析，也不占用缓存和解析线程
+
+        now = time.time()
+        with self._lock:
+            entry = self._cache.get(host)
+            if entry and entry[1] > now:
+                return entry[0]
+            future = self._executor.submit(self._resolve, host)
+            self._cache[host] = (future, now + self.ttl)
+        future.add_done_callback(lambda f: self._store(host, f))
+        return future
+
+    def _store(self, host, future):
+        """解析完成后用IP替换占位Future，失败则移除以便下次重试"""
+        with self._lock:
+            entry = self._cache.get(host)
+            if not entry or entry[0] is not future:
+                return
+            if not future.cancelled() and future.exception() is None:
+                self._cache[host] = (future.result(), entry[1])
+            else:
+                del self._cache[host]
+
+    @staticmethod
+    def _resolve(host):
+        return socket.getaddrinfo(host, None, socket.AF_INET, socket.SOCK_STREAM)[0][4][0]
+
+
+class WorkerSignals(QObject):
+    """线程池任务的信号桥（任务在普通线程中运行，通过它把结果送回主线程）"""
+    test_result = pyqtSignal(object)  # PingResult
+    finished = pyqtSignal(str)  # 目标地址
+    error = pyqtSignal(str, str)  # 目标地址, 错误信息
+
+
+def split_targets(text):
+    """按逗号、分号、空白切分目标地址，去重时保留首次出现的顺序
+
+    例如 "b,a;b\nc" -> ['b', 'a', 'c']
+    """
+    return list(dict.fromkeys(_TARGET_RE.findall(text)))
+
+
+def read_targets(path):
+    """从文件读取目标地址，逐行切分并即时去重（保持文件中的顺序），不保留整份文件内容"""
+    seen = {}
+    with open(path, 'r', encoding='utf-8', buffering=1 << 16) as f:
+        for line in f:
+            seen.update(dict.fromkeys(_TARGET_RE.findall(line)))
+    return list(seen)
+
+
+def _ping_command(ip, count):
+    """系统ping命令行，每个回复最多等待1秒"""
+    if sys.platform == "win32":
+        return ["ping", "-n", str(count), "-w", "1000", ip]
+    if sys.platform == "darwin":
+        return ["ping", "-c", str(count), "-W", "1000", ip]
+    return ["ping", "-c", str(count), "-W", "1", ip]
+
+
+def run_ping_test(target, dns_cache, ping_count, cancel_event):
+    """执行单个目标的Ping测试，由线程池调度执行
+
+    每个目标只启动一个系统ping进程，等待期间定期检查cancel_event，置位后结束进程
+    并直接返回（不再上报结果），关闭窗口时无需等完整轮Ping结束。
+    """
+    if cancel_event.is_set():
+        return None
 
-class NetworkTestWorker(QObject):
-    """整合Ping和端口测试的工作线程"""
-    test_result = pyqtSignal(str, str)  # 目标地址, JSON结果
+    try:
+        command = _ping_command(dns_cache.resolve(target), ping_count)
+        with subprocess.Popen(
+            command, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True
+        ) as proc:
+            while True:
+                try:
+                    output, _ = proc.communicate(timeout=0.2)
+                    break
+                except subprocess.TimeoutExpired:
+                    if cancel_event.is_set():
+                        proc.kill()
+                        return None
+
+        stats = _PING_PARSER.parse(output).as_dict()
+        logger.debug("原始Ping结果: %s", stats)
+
+        return PingResult(target, stats["rtt_avg"], stats["packet_loss_rate"])
+    except Exception as e:
+        logger.warning("Ping测试错误: %s", e)
+        return PingResult(target, error=str(e))
+
+
+class PingScanner(QObject):
+    """Ping测试：icmplib + asyncio，在单个线程内并发ping所有目标"""
+    test_result = pyqtSignal(object)  # PingResult
     finished = pyqtSignal(str)  # 目标地址
     error = pyqtSignal(str, str)  # 目标地址, 错误信息
+    scan_finished = pyqtSignal()  # 全部目标测试结束
 
-    def __init__(self, target, ping_count=4, port=None, port_timeout=3):
+    def __init__(self, targets, dns_cache, ping_count=4, concurrent_tasks=50):
         super().__init__()
-        self.target = target
+        self.targets = targets
+        self.dns_cache = dns_cache
         self.ping_count = ping_count
-        self.port = port
-        self.port_timeout = port_timeout
-        self._is_running = True
-        self._socket = None  # 用于存储socket对象
+        self.concurrent_tasks = concurrent_tasks
+        self._cancelled = False
+        self._loop = None
+        self._task = None
+
+    def run(self):
+        """在本线程的事件循环中执行所有Ping"""
+        self._loop = asyncio.new_event_loop()
+        try:
+            self._task = self._loop.create_task(self._ping_all())
+            if self._cancelled:
+                # stop()在任务创建前调用时没有可取消的任务，这里补上
+                self._task.cancel()
+            self._loop.run_until_complete(self._task)
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self._loop.close()
+            self.scan_finished.emit()
+
+    async def _ping_all(self):
+        semaphore = asyncio.Semaphore(self.concurrent_tasks)
+        await asyncio.gather(*(self._ping(target, semaphore) for target in self.targets))
 
-        # Ping相关初始化
-        if ping_count > 0:
-            self.ping_parser = pingparsing.PingParsing()
-            self.ping_transmitter = pingparsing.PingTransmitter()
-            self.ping_transmitter.destination = self.target
-            self.ping_transmitter.timeout = 1
-            self.ping_transmitter.count = self.ping_count
+    async def _ping(self, target, semaphore):
+        """Ping单个目标并上报结果"""
+        async with semaphore:
+            try:
+                ip = await self._loop.run_in_executor(None, self.dns_cache.resolve, target)
+                host = await icmplib.async_ping(
+                    ip, count=self.ping_count, timeout=1, privileged=False
+                )
+                result = PingResult(
+                    target,
+                    host.avg_rtt if host.is_alive else None,
+                    host.packet_loss * 100
+                )
+                if not self._cancelled:
+                    self.test_result.emit(result)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                if not self._cancelled:
+                    self.error.emit(target, f"测试错误: {str(e)}")
+            finally:
+                if not self._cancelled:
+                    self.finished.emit(target)
+
+    def stop(self):
+        """停止Ping测试"""
+        self._cancelled = True
+        if self._loop and self._task:
+            try:
+                self._loop.call_soon_threadsafe(self._task.cancel)
+            except RuntimeError:
+                pass  # 事件循环已关闭
+
+
+class FpingScanner(QObject):
+    """Ping测试：一个fping子进程批量ping所有目标，只解析一次输出"""
+    test_result = pyqtSignal(object)  # PingResult
+    finished = pyqtSignal(str)  # 目标地址
+    error = pyqtSignal(str, str)  # 目标地址, 错误信息
+    scan_finished = pyqtSignal()  # 全部目标测试结束
+
+    def __init__(self, targets, dns_cache, ping_count=4):
+        super().__init__()
+        self.targets = targets
+        self.dns_cache = dns_cache
+        self.ping_count = ping_count
+        self._cancelled = False
+        self._proc = None
 
     def run(self):
-        """执行测试"""
-        if not self._is_running:
+        """解析所有目标后启动fping并逐行解析结果"""
+        try:
+            hosts = {}  # IP -> 解析到该IP的目标地址
+            for target in self.targets:
+                try:
+                    hosts.setdefault(self.dns_cache.resolve(target), []).append(target)
+                except Exception as e:
+                    self._emit_error(target, f"测试错误: {str(e)}")
+
+            error_msg = "测试错误: fping未返回结果"
+            if hosts and not self._cancelled:
+                try:
+                    self._run_fping(hosts)
+                except Exception as e:
+                    error_msg = f"测试错误: {str(e)}"
+
+            # 未出现在fping输出中的目标
+            for targets in hosts.values():
+                for target in targets:
+                    self._emit_error(target, error_msg)
+        finally:
+            self.scan_finished.emit()
+
+    def _run_fping(self, hosts):
+        """执行fping，结果在stderr中每个目标一行，已上报的目标从hosts中移除
+
+        fping放在独立的进程组中，stop()时整组结束；with块退出时关闭管道并回收进程。
+        """
+        with subprocess.Popen(
+            [_FPING_PATH, "-c", str(self.ping_count), "-q", "-t", "1000", *hosts],
+            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True,
+            start_new_session=True
+        ) as self._proc:
+            for line in self._proc.stderr:
+                if self._cancelled:
+                    break
+                match = _FPING_RE.match(line)
+                if not match:
+                    continue
+                avg = match["avg"]
+                for target in hosts.pop(match["host"], []):
+                    self._emit(PingResult(target, float(avg) if avg else None, float(match["loss"])))
+
+    def _emit(self, result):
+        if self._cancelled:
             return
+        self.test_result.emit(result)
+        self.finished.emit(result.target)
 
-        try:
-            result = {
-                "target": self.target,
-                "ping": None,
-                "port": None
-            }
+    def _emit_error(self, target, error_msg):
+        if self._cancelled:
+            return
+        self.error.emit(target, error_msg)
+        self.finished.emit(target)
 
-            # 执行Ping测试
-            if self.ping_count > 0:
-                ping_result = self._run_ping_test()
-                if ping_result:
-                    result["ping"] = ping_result
+    def stop(self):
+        """停止Ping测试"""
+        self._cancelled = True
+        if self._proc and self._proc.poll() is None:
+            try:
+                if hasattr(os, "killpg"):
+                    os.killpg(self._proc.pid, signal.SIGTERM)
+                else:
+                    self._proc.terminate()
+            except OSError:
+                pass
 
-            # 执行端口测试
-            if self.port:
-                port_result = self._run_port_test()
-                if port_result:
-                    result["port"] = port_result
 
-            if self._is_running:
-                self.test_result.emit(self.target, json.dumps(result))
+class PortScanner(QObject):
+    """端口测试：非阻塞socket + selectors，在单个线程内并发探测所有目标
 
-        except Exception as e:
-            if self._is_running:
-                self.error.emit(self.target, f"测试错误: {str(e)}")
+    探测分为 _scan_init / _scan_resolve / _scan_port / _scan_wait / _scan_free 几步，
+    selector在整个扫描期间只创建一次；所有目标先解析完再发起连接，域名解析的耗时
+    不会算进任何连接的超时和响应时间；_scan_port 按(目标, IP, 端口)发起探测，
+    多端口扫描时直接复用。
+    同时进行中的连接不超过MAX_PENDING个，避免目标很多时耗尽文件描述符。
+    """
+    test_result = pyqtSignal(object)  # PortResult
+    finished = pyqtSignal(str)  # 目标地址
+    scan_finished = pyqtSignal()  # 全部目标探测结束
+
+    POLL_INTERVAL_NS = 200_000_000  # select单次最长等待，保证stop()后能及时退出
+    MAX_PENDING = 512  # 同时进行中的连接数上限（低于常见的1024文件描述符限制）
+
+    def __init__(self, targets, port, dns_cache, port_timeout=3):
+        super().__init__()
+        self.targets = targets
+        self.dns_cache = dns_cache
+        self.port = port
+        self.port_timeout = port_timeout
+        self._timeout_ns = int(port_timeout * 1e9)
+        self._cancelled = False
+        self._selector = None
+        self._deadlines = None
+
+    def run(self):
+        """发起所有连接并等待结果"""
+        self._scan_init()
+        try:
+            for target, ip in self._scan_resolve():
+                if self._cancelled:
+                    return
+                if isinstance(ip, Exception):
+                    self._emit(PortResult(target, self.port, False, f"连接失败: {str(ip)}"))
+                    continue
+                if len(self._selector.get_map()) >= self.MAX_PENDING:
+                    self._scan_wait(self.MAX_PENDING - 1)
+                self._scan_port(target, ip, self.port)
+            self._scan_wait()
         finally:
-            if self._is_running:
-                self.finished.emit(self.target)
-            self._is_running = False
+            self._scan_free()
+            self.scan_finished.emit()
+
+    def _scan_init(self):
+        """创建本次扫描共用的selector和超时队列"""
+        self._selector = selectors.DefaultSelector()
+        # (截止时间, socket)：超时时间固定，按发起顺序入队即按截止时间有序
+        self._deadlines = collections.deque()
+
+    def _scan_resolve(self):
+        """解析所有目标，返回[(目标, IP或解析异常)]，停止后不再继续解析"""
+        resolved = []
+        for target in self.targets:
+            if self._cancelled:
+                break
+            try:
+                resolved.append((target, self.dns_cache.resolve(target)))
+            except Exception as e:
+                resolved.append((target, e))
+        return resolved
 
-    def _run_ping_test(self):
-        """执行Ping测试"""
+    def _scan_port(self, target, ip, port):
+        """发起单个非阻塞连接，注册到selector等待可写"""
         try:
-            result = self.ping_transmitter.ping()
-            if not self._is_running:
-                return None
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        except OSError as e:
+            self._emit(PortResult(target, port, False, f"连接失败: {str(e)}"))
+            return
 
-            parsed_result = self.ping_parser.parse(result)
-            stats = parsed_result.as_dict()
+        sock.setblocking(False)
+        try:
+            start_time = time.perf_counter_ns()
+            err = sock.connect_ex((ip, port))
+        except Exception as e:
+            sock.close()
+            self._emit(PortResult(target, port, False, f"连接失败: {str(e)}"))
+            return
 
-            print(f"原始Ping结果: {stats}")  # 调试输出
+        if err not in _CONNECT_PENDING:
+            sock.close()
+            self._report(target, port, err, start_time)
+            return
 
-            return {
-                "latency": stats["rtt_avg"],
-                "loss": stats["packet_loss_rate"],
-                "raw": stats
-            }
-        except Exception as e:
-            print(f"Ping测试错误: {str(e)}")  # 调试输出
-            return {
-                "latency": "--",
-                "loss": "--",
-                "error": str(e)
-            }
+        self._selector.register(sock, selectors.EVENT_WRITE, (target, port, start_time))
+        self._deadlines.append((start_time + self._timeout_ns, sock))
+
+    def _scan_wait(self, limit=0):
+        """等待已发起的连接完成，直到进行中的连接不超过limit个
+
+        每个连接从各自发起时刻起计算port_timeout。每轮先收取已就绪的连接再判定超时，
+        截止时间已过时以select(0)收取，早已连上的socket不会因本线程被耽搁而误判为超时。
+        已完成的socket已被关闭（fileno()为-1），从超时队列队首取到时直接丢弃。
+        """
+        selector = self._selector
+        deadlines = self._deadlines
+        while len(selector.get_map()) > limit and not self._cancelled:
+            while deadlines[0][1].fileno() == -1:
+                deadlines.popleft()
+            timeout = max(0, min(deadlines[0][0] - time.perf_counter_ns(), self.POLL_INTERVAL_NS))
+            for key, _ in selector.select(timeout=timeout / 1e9):
+                sock = key.fileobj
+                target, port, start_time = key.data
+                selector.unregister(sock)
+                err = sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+                sock.close()
+                self._report(target, port, err, start_time)
+
+            now = time.perf_counter_ns()
+            while deadlines and (deadlines[0][1].fileno() == -1 or deadlines[0][0] <= now):
+                _, sock = deadlines.popleft()
+                if sock.fileno() == -1:
+                    continue
+                target, port, _ = selector.get_key(sock).data
+                selector.unregister(sock)
+                sock.close()
+                self._emit(PortResult(target, port, False, "连接超时"))
+
+    def _scan_free(self):
+        """关闭未完成的连接和selector"""
+        for key in list(self._selector.get_map().values()):
+            key.fileobj.close()
+        self._selector.close()
+        self._selector = None
+        self._deadlines = None
+
+    def _report(self, target, port, err, start_time):
+        """根据SO_ERROR生成端口测试结果"""
+        if err == 0:
+            elapsed_ms = (time.perf_counter_ns() - start_time) / 1e6
+            result = PortResult(
+                target, port, True,
+                f"连接成功 (响应时间: {elapsed_ms:.3f}ms)", elapsed_ms
+            )
+        elif err in _CONNECT_REFUSED:
+            result = PortResult(target, port, False, "连接被拒绝")
+        else:
+            result = PortResult(target, port, False, f"连接失败: {os.strerror(err)}")
+        self._emit(result)
+
+    def _emit(self, result):
+        """发送单个目标的端口测试结果"""
+        if self._cancelled:
+            return
+        self.test_result.emit(result)
+        self.finished.emit(result.target)
+
+    def stop(self):
+        """停止端口测试"""
+        self._cancelled = True
+
+
+class ResultsModel(QAbstractTableModel):
+    """测试结果表格模型：每个目标一行，更新一行只通知视图一次"""
+    COLUMNS = ["target", "ping_latency", "ping_loss", "port", "port_status"]
+    HEADERS = ["IP地址", "Ping延迟(ms)", "Ping丢包率(%)", "端口号", "端口状态"]
+    # 列 -> 颜色/提示所属的测试（ping_color、port_tip等）
+    _GROUPS = {1: "ping", 2: "ping", 4: "port"}
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows = []
+        self._index = {}  # 目标地址 -> 行号
 
-    def _run_port_test(self):
-        """执行端口测试"""
-        if not self.port:
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
             return None
 
-        try:
-            # 创建socket连接
-            self._socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            self._socket.settimeout(self.port_timeout)
-
-            # 尝试连接
-            start_time = time.time()
-            self._socket.connect((self.target, self.port))
-            end_time = time.time()
-
-            return {
-                "status": True,
-                "port": self.port,
-                "response_time": (end_time - start_time) * 1000,
-                "msg": f"连接成功 (响应时间: {(end_time - start_time) * 1000:.2f}ms)"
-            }
+        row = self._rows[index.row()]
+        col = index.column()
+        if role == Qt.ItemDataRole.DisplayRole:
+            return row[self.COLUMNS[col]]
+        if role == Qt.ItemDataRole.TextAlignmentRole:
+            return Qt.AlignmentFlag.AlignCenter if col > 0 else None
 
-        except socket.timeout:
-            return {
-                "status": False,
-                "port": self.port,
-                "msg": "连接超时"
-            }
-        except ConnectionRefusedError:
-            return {
-                "status": False,
-                "port": self.port,
-                "msg": "连接被拒绝"
-            }
-        except Exception as e:
-            return {
-                "status": False,
-                "port": self.port,
-                "msg": f"连接失败: {str(e)}"
+        group = self._GROUPS.get(col)
+        if group is None:
+            return None
+        if role == Qt.ItemDataRole.ForegroundRole:
+            return row.get(f"{group}_color")
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return row.get(f"{group}_tip")
+        return None
+
+    def set_targets(self, targets, port_text):
+        """为每个目标生成一行初始数据"""
+        self.beginResetModel()
+        self._rows = [
+            {
+                "target": target,
+                "ping_latency": "测试中...",
+                "ping_loss": "测试中...",
+                "port": port_text,
+                "port_status": "测试中...",
             }
-        finally:
-            if self._socket:
-                try:
-                    self._socket.close()
-                except:
-                    pass
-                self._socket = None
+            for target in targets
+        ]
+        self._index = {target: row for row, target in enumerate(targets)}
+        self.endResetModel()
 
-    def stop(self):
-        """停止测试操作"""
-        self._is_running = False
+    def row_of(self, target):
+        """目标地址所在行号，不存在时返回None"""
+        return self._index.get(target)
 
-        # 停止ping操作
-        if hasattr(self, 'ping_transmitter') and self.ping_transmitter:
-            try:
-                if hasattr(self.ping_transmitter, 'stop'):
-                    self.ping_transmitter.stop()
-            except:
-                pass
+    def set_row(self, row, values):
+        """更新一行的数据，只发出一次dataChanged"""
+        self._rows[row].update(values)
+        self.dataChanged.emit(self.index(row, 1), self.index(row, len(self.COLUMNS) - 1))
 
-        # 关闭socket连接
-        if self._socket:
-            try:
-                self._socket.close()
-            except:
-                pass
-            self._socket = None
+    def records(self):
+        """按列顺序返回每行的文本元组，用于导出"""
+        return map(operator.itemgetter(*self.COLUMNS), self._rows)
+
+    def clear(self):
+        """清空所有行"""
+        self.beginResetModel()
+        self._rows = []
+        self._index = {}
+        self.endResetModel()
 
 
 class NetworkTool(QMainWindow):
+    # 结果颜色：成功 / 有丢包 / 失败，所有行共用，不在每个结果上重新解析颜色名
+    _COLOR_OK = QColor("#10b981")
+    _COLOR_WARN = QColor("#f59e0b")
+    _COLOR_ERR = QColor("#ef4444")
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("网速先知")
@@ -179,20 +648,35 @@ class NetworkTool(QMainWindow):
         self.init_ui()
         self.init_styles()
 
-        # 工作线程管理
-        self.test_workers = {}
-        self.test_threads = {}
+        # 工作线程管理：固定大小的线程池 + 本轮提交的任务
+        self._executor = ThreadPoolExecutor(max_workers=64)
+        self._futures = []
+
+        # 域名解析缓存，Ping和端口测试共用
+        self.dns_cache = DNSCache()
+
+        # 批量扫描线程：Ping（icmplib或fping）和端口各占一个线程，元素为(扫描器, 线程)
+        self.scanners = []
+
+        # 所有任务共享同一个信号桥，只需连接一次
+        self.worker_signals = WorkerSignals()
+        self.worker_signals.test_result.connect(self._handle_test_result)
+        self.worker_signals.error.connect(self._handle_test_error)
+        self.worker_signals.finished.connect(self._on_ping_finished)
+
+        # 结果暂存队列，每100ms批量刷新到表格
+        self._pending = collections.deque()
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setInterval(100)
+        self._flush_timer.timeout.connect(self._flush_table)
 
         # 状态跟踪
         self.target_count = 0
-        self.test_finished_count = 0
-        self._lock = threading.Lock()
-        self._is_stopping = False
-
-        self.test_workers = {}
-        self.test_threads = {}
+        self.ping_finished_count = 0
+        self.port_finished_count = 0
+        self._ping_done = itertools.count(1)
+        self._port_done = itertools.count(1)
         self._stop_event = threading.Event()  # 用于协调停止操作
-        self._stop_lock = threading.Lock()  # 停止操作专用锁
 
     def init_ui(self):
         """初始化用户界面"""
@@ -300,11 +784,9 @@ class NetworkTool(QMainWindow):
         results_layout.setContentsMargins(10, 15, 10, 10)
 
         # 创建表格
-        self.results_table = QTableWidget()
-        self.results_table.setColumnCount(5)
-        self.results_table.setHorizontalHeaderLabels([
-            "IP地址", "Ping延迟(ms)", "Ping丢包率(%)", "端口号", "端口状态"
-        ])
+        self.results_model = ResultsModel(self)
+        self.results_table = QTableView()
+        self.results_table.setModel(self.results_model)
 
         # 表格样式设置
         header = self.results_table.horizontalHeader()
@@ -313,9 +795,11 @@ class NetworkTool(QMainWindow):
         header.setSectionResizeMode(2, QHeaderView.ResizeMode.ResizeToContents)
         header.setSectionResizeMode(3, QHeaderView.ResizeMode.ResizeToContents)
         header.setSectionResizeMode(4, QHeaderView.ResizeMode.Stretch)
+        # 按内容调整列宽时只采样前100行，避免目标很多时每次刷新都遍历全表
+        header.setResizeContentsPrecision(100)
 
-        self.results_table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
-        self.results_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.results_table.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
+        self.results_table.setEditTriggers(QTableView.EditTrigger.NoEditTriggers)
         self.results_table.setAlternatingRowColors(True)
 
         results_layout.addWidget(self.results_table)
@@ -383,7 +867,7 @@ class NetworkTool(QMainWindow):
             QPushButton:pressed {
                 background-color: #1d4ed8;
             }
-            QTableWidget {
+            QTableView {
                 border: 1px solid #d1d5db;
                 border-radius: 6px;
                 background-color: white;
@@ -434,8 +918,7 @@ class NetworkTool(QMainWindow):
         """
         检查输入是否为有效的 IPv4 地址
         """
-        pattern = r'^((25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)\.){3}(25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)$'
-        return bool(re.match(pattern, ip))
+        return bool(_IPV4_RE.match(ip))
 
     def is_valid_domain(self, domain):
         """
@@ -456,7 +939,7 @@ class NetworkTool(QMainWindow):
 
     def start_testing(self):
         """开始测试"""
-        print("开始测试")  # 调试输出
+        logger.debug("开始测试")
         # 获取并验证输入
         targets = self._parse_targets()
         flag = True
@@ -487,60 +970,38 @@ class NetworkTool(QMainWindow):
 
         # 重置计数器
         self.target_count = len(targets)
-        self.test_finished_count = 0
-        print(f"目标数量: {self.target_count}")  # 调试输出
+        self.ping_finished_count = 0
+        self.port_finished_count = 0
+        self._ping_done = itertools.count(1)
+        self._port_done = itertools.count(1)
+        logger.debug("目标数量: %s", self.target_count)
 
         # 初始化UI状态
         self._init_results_table(targets)
         self._set_ui_testing_state(True)
-
-        # 开始测试
-        for target in targets:
-            self._start_test(target, ping_count, port)
+        self._pending.clear()
+        self._flush_timer.start()
+
+        # 开始测试：先并发解析域名，Ping和端口各由单个线程批量执行
+        self.dns_cache.prefetch(targets)
+        self.scanners = []  # 上一轮的扫描线程均已结束并自行回收
+        self._futures = []
+        self._stop_event.clear()
+        if _ICMPLIB_USABLE or _FPING_PATH:
+            self._start_ping_scan(targets, ping_count)
+        else:
+            # icmplib不可用且没有fping时，退回到线程池中逐个调用系统ping
+            for target in targets:
+                self._start_test(target, ping_count)
+        self._start_port_scan(targets, port)
 
     def _parse_targets(self):
         """解析目标地址输入"""
-        input_text = self.ping_host.text().strip()
-        if not input_text:
-            return []
-
-        # 支持逗号、空格、换行分隔
-        separators = [',', ' ', '\n', ';']
-        for sep in separators:
-            input_text = input_text.replace(sep, ' ')
-
-        # 分割并去重
-        targets = list(set(t.strip() for t in input_text.split() if t.strip()))
-        return targets
+        return split_targets(self.ping_host.text())
 
     def _init_results_table(self, targets):
         """初始化结果表格"""
-        self.results_table.setRowCount(len(targets))
-
-        for row, target in enumerate(targets):
-            # IP地址列
-            ip_item = QTableWidgetItem(target)
-            self.results_table.setItem(row, 0, ip_item)
-
-            # Ping延迟列
-            ping_latency_item = QTableWidgetItem("测试中...")
-            ping_latency_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.results_table.setItem(row, 1, ping_latency_item)
-
-            # Ping丢包率列
-            ping_loss_item = QTableWidgetItem("测试中...")
-            ping_loss_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.results_table.setItem(row, 2, ping_loss_item)
-
-            # 端口号列
-            port_item = QTableWidgetItem(self.port_test_port.text())
-            port_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.results_table.setItem(row, 3, port_item)
-
-            # 端口状态列
-            port_status_item = QTableWidgetItem("测试中...")
-            port_status_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.results_table.setItem(row, 4, port_status_item)
+        self.results_model.set_targets(targets, self.port_test_port.text())
 
     def _set_ui_testing_state(self, testing):
         """设置UI测试状态"""
@@ -554,212 +1015,217 @@ class NetworkTool(QMainWindow):
         self.progress_bar.setVisible(testing)
 
         if testing:
-            self.progress_bar.setRange(0, self.target_count)
+            # Ping和端口测试各计一次进度
+            self.progress_bar.setRange(0, self.target_count * 2)
             self.progress_bar.setValue(0)
             self.status_label.setText("测试进行中...")
         else:
             self.status_label.setText("就绪")
 
-    def _start_test(self, target, ping_count, port):
-        """启动单个测试"""
-        print(f"启动测试: {target}")  # 调试输出
-        if target in self.test_workers:
-            self._stop_test(target)
+    def _start_test(self, target, ping_count):
+        """提交单个Ping测试到线程池"""
+        logger.debug("启动测试: %s", target)
+        future = self._executor.submit(
+            run_ping_test, target, self.dns_cache, ping_count, self._stop_event
+        )
+        future.add_done_callback(lambda f, t=target: self._on_future_done(t, f))
+        self._futures.append(future)
+
+    def _on_future_done(self, target, future):
+        """线程池任务结束（在工作线程中调用），经信号桥把结果送回主线程"""
+        if future.cancelled() or self._stop_event.is_set():
+            return
 
-        # 创建工作线程
-        worker = NetworkTestWorker(target, ping_count, port)
+        error = future.exception()
+        if error:
+            self.worker_signals.error.emit(target, f"测试错误: {str(error)}")
+        elif future.result():
+            self.worker_signals.test_result.emit(future.result())
+        self.worker_signals.finished.emit(target)
+
+    def _start_ping_scan(self, targets, ping_count):
+        """在单个线程中批量Ping所有目标（icmplib可用时优先，其次fping）"""
+        scanner_cls = PingScanner if _ICMPLIB_USABLE else FpingScanner
+        scanner = scanner_cls(targets, self.dns_cache, ping_count)
+        scanner.test_result.connect(self._handle_test_result)
+        scanner.error.connect(self._handle_test_error)
+        scanner.finished.connect(self._on_ping_finished)
+        self._run_in_thread(scanner)
+
+    def _start_port_scan(self, targets, port):
+        """在单个线程中批量探测所有目标的端口"""
+        scanner = PortScanner(targets, port, self.dns_cache)
+        scanner.test_result.connect(self._handle_test_result)
+        scanner.finished.connect(self._on_port_finished)
+        self._run_in_thread(scanner)
+
+    def _run_in_thread(self, scanner):
+        """将扫描器移入新线程运行
+
+        回收只在这里连接一次：扫描结束 -> 线程退出 -> 扫描器和线程各自deleteLater，
+        停止时也走同一条路径，不再另行清理。
+        """
         thread = QThread()
-        worker.moveToThread(thread)
+        scanner.moveToThread(thread)
 
-        # 确保信号连接正确
-        def handle_result(t, r):
-            print(f"收到结果: {t}")  # 调试输出
-            print(r)
-            self._handle_test_result(t, r)
+        thread.started.connect(scanner.run)
+        scanner.scan_finished.connect(thread.quit)
+        thread.finished.connect(scanner.deleteLater)
+        thread.finished.connect(thread.deleteLater)
 
-        def handle_error(t, e):
-            print(f"收到错误: {t}, {e}")  # 调试输出
-            self._handle_test_error(t, e)
+        self.scanners.append((scanner, thread))
+        thread.start()
 
-        def handle_finished(t):
-            print(f"测试完成信号: {t}")  # 调试输出
-            self._on_test_finished(t)
+    def _scanners_running(self):
+        """是否还有扫描线程在运行"""
+        return any(
+            not sip.isdeleted(thread) and thread.isRunning()
+            for _, thread in self.scanners
+        )
 
-        # 连接信号
-        thread.started.connect(worker.run)
-        worker.test_result.connect(handle_result)
-        worker.error.connect(handle_error)
-        worker.finished.connect(handle_finished)
+    def _stop_scanners(self):
+        """先通知所有扫描器停止，再统一等待线程退出
 
-        thread.finished.connect(thread.deleteLater)
-        thread.finished.connect(worker.deleteLater)
+        扫描器都会自行检查取消标志（select/fping/asyncio/域名解析均能及时返回），
+        不强制terminate线程。scan_finished -> thread.quit 是排队到GUI线程执行的，
+        而这里正阻塞着GUI线程，所以要直接调用quit()。
+        """
+        scanners, self.scanners = self.scanners, []
+        running = [
+            (scanner, thread) for scanner, thread in scanners
+            if not sip.isdeleted(thread) and thread.isRunning()
+        ]
+        for scanner, thread in running:
+            scanner.stop()
+            thread.quit()
+        for _, thread in running:
+            thread.wait()
 
-        # 存储引用
-        self.test_workers[target] = worker
-        self.test_threads[target] = thread
+    def _handle_test_error(self, target, error_msg):
+        """处理测试错误：暂存，由定时器批量刷新到表格"""
+        self._pending.append(("error", target, error_msg))
 
-        # 启动线程
-        thread.start()
+    def _handle_test_result(self, result):
+        """处理测试结果（PingResult/PortResult）：暂存，由定时器批量刷新到表格"""
+        self._pending.append(("result", result.target, result))
 
-    def _stop_test(self, target):
-        """停止单个测试"""
-        worker = self.test_workers.pop(target, None)
-        thread = self.test_threads.pop(target, None)
+    def _flush_table(self):
+        """批量应用暂存的结果并刷新进度条，整批只触发一次重绘"""
+        if sip.isdeleted(self.results_table):
+            return
 
-        if worker:
-            worker.stop()
-            if not sip.isdeleted(worker):
-                worker.deleteLater()
+        done = self.ping_finished_count + self.port_finished_count
+        if self.progress_bar.value() != done:
+            self.progress_bar.setValue(done)
+        if not self._pending:
+            return
 
-        if thread and thread.isRunning():
-            thread.quit()
-            if not thread.wait(500):
-                thread.terminate()
-                thread.wait()
-            if not sip.isdeleted(thread):
-                thread.deleteLater()
-
-    def _find_target_row(self, target):
-        """查找目标地址在表格中的行号"""
+        self.results_table.setUpdatesEnabled(False)
         try:
-            for row in range(self.results_table.rowCount()):
-                item = self.results_table.item(row, 0)
-                if item and item.text() == target:
-                    return row
-            return None
-        except Exception as e:
-            print(f"查找行错误: {str(e)}")  # 调试输出
-            return None
+            while self._pending:
+                kind, target, data = self._pending.popleft()
+                if kind == "error":
+                    self._update_error_row(target, data)
+                else:
+                    self._update_result_row(target, data)
+        finally:
+            self.results_table.setUpdatesEnabled(True)
 
-    def _handle_test_error(self, target, error_msg):
-        """处理测试错误"""
-        row = self._find_target_row(target)
+    def _update_error_row(self, target, error_msg):
+        """将测试错误写入表格"""
+        row = self.results_model.row_of(target)
         if row is None:
             return
 
-        # 标记Ping结果为错误
-        for col in [1, 2]:
-            item = QTableWidgetItem("错误")
-            item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            item.setForeground(QColor("#ef4444"))
-            self.results_table.setItem(row, col, item)
-
-        # 标记端口测试结果为错误
-        item = QTableWidgetItem("错误")
-        item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-        item.setForeground(QColor("#ef4444"))
-        item.setToolTip(error_msg)
-        self.results_table.setItem(row, 4, item)
+        # 标记Ping结果为错误（端口测试结果由PortScanner单独上报）
+        self.results_model.set_row(row, {
+            "ping_latency": "错误",
+            "ping_loss": "错误",
+            "ping_color": self._COLOR_ERR,
+            "ping_tip": error_msg,
+        })
 
         self.status_label.setText(f"{target}: {error_msg}")
 
-    def _handle_test_result(self, target, result_json):
-        """处理测试结果 - 确保在主线程执行"""
+    def _update_result_row(self, target, result):
+        """将测试结果写入表格，每个结果只更新一次对应行"""
         try:
-            if sip.isdeleted(self.results_table):  # 检查表格是否已被删除
-                return
-
-            result = json.loads(result_json)
-            row = self._find_target_row(target)
+            row = self.results_model.row_of(target)
             if row is None:
                 return
 
             # 处理Ping结果
-            if "ping" in result:
-                ping_result = result["ping"]
-                latency = ping_result.get("latency", "--")
-                loss = ping_result.get("loss", "--")
-
-                # 确保在主线程更新UI
-                def update_ping():
-                    if sip.isdeleted(self.results_table):
-                        return
-                    # 更新延迟
-                    latency_text = str(latency) if latency != "--" else "--"
-                    latency_item = QTableWidgetItem(latency_text)
-                    latency_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                    self.results_table.setItem(row, 1, latency_item)
-
-                    # 更新丢包率
-                    loss_percent = f"{float(loss):.1f}%" if loss != "--" else "--"
-                    loss_item = QTableWidgetItem(loss_percent)
-                    loss_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                    self.results_table.setItem(row, 2, loss_item)
-
-                    # 设置颜色
-                    color = QColor()
-                    if latency == "--" or loss == "--":
-                        color.setNamedColor("#ef4444")
-                    elif float(loss) > 0:
-                        color.setNamedColor("#f59e0b")
-                    else:
-                        color.setNamedColor("#10b981")
-
-                    for col in [1, 2]:
-                        item = self.results_table.item(row, col)
-                        if item:
-                            item.setForeground(color)
-
-                QTimer.singleShot(0, update_ping)
+            if isinstance(result, PingResult):
+                latency, loss = result.latency, result.loss
+
+                # 设置颜色
+                if latency is None or loss is None:
+                    color = self._COLOR_ERR
+                elif loss > 0:
+                    color = self._COLOR_WARN
+                else:
+                    color = self._COLOR_OK
+
+                self.results_model.set_row(row, {
+                    "ping_latency": str(latency) if latency is not None else "--",
+                    "ping_loss": f"{loss:.1f}%" if loss is not None else "--",
+                    "ping_color": color,
+                    "ping_tip": result.error,
+                })
 
             # 处理端口测试结果
-            if "port" in result:
-                port_result = result["port"]
-                status = port_result.get("status", False)
-                msg = port_result.get("msg", "未知状态")
-
-                def update_port():
-                    if sip.isdeleted(self.results_table):
-                        return
-                    status_item = QTableWidgetItem("成功" if status else "失败")
-                    status_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                    status_item.setToolTip(msg)
-                    status_item.setForeground(QColor("#10b981" if status else "#ef4444"))
-                    self.results_table.setItem(row, 4, status_item)
-
-                QTimer.singleShot(0, update_port)
+            elif isinstance(result, PortResult):
+                self.results_model.set_row(row, {
+                    "port_status": "成功" if result.status else "失败",
+                    "port_color": self._COLOR_OK if result.status else self._COLOR_ERR,
+                    "port_tip": result.msg,
+                })
 
         except Exception as e:
-            print(f"处理结果错误: {str(e)}")
+            logger.warning("处理结果错误: %s", e)
 
-    def _on_test_finished(self, target):
-        """单个测试完成处理"""
-        print(f"测试完成: {target}")
+    def _on_ping_finished(self, target):
+        """单个Ping测试完成处理"""
+        logger.debug("Ping测试完成: %s", target)
         try:
-            with self._lock:
-                self.test_finished_count += 1
-                print(f"进度: {self.test_finished_count}/{self.target_count}")
-
-                # 使用invokeMethod确保线程安全
-                self.progress_bar.setValue(self.test_finished_count)
-
-                # 清理资源
-                if target in self.test_workers:
-                    worker = self.test_workers.pop(target)
-                    if worker and not sip.isdeleted(worker):
-                        worker.deleteLater()
-
-                if target in self.test_threads:
-                    thread = self.test_threads.pop(target)
-                    if thread and thread.isRunning():
-                        thread.quit()
-                        if not thread.wait(500):
-                            thread.terminate()
-                        if not sip.isdeleted(thread):
-                            thread.deleteLater()
-
-                # 检查是否全部完成
-                if self.test_finished_count >= self.target_count:
-                    print("所有测试已完成，准备更新UI")
-                    # 确保在主线程执行UI更新
-                    QTimer.singleShot(0, self._finalize_testing)
+            self.ping_finished_count = next(self._ping_done)
+            self._update_progress()
         except Exception as e:
-            print(f"完成处理错误: {str(e)}")
+            logger.warning("完成处理错误: %s", e)
+
+    def _on_port_finished(self, target):
+        """单个端口测试完成处理"""
+        logger.debug("端口测试完成: %s", target)
+        try:
+            self.port_finished_count = next(self._port_done)
+            self._update_progress()
+        except Exception as e:
+            logger.warning("完成处理错误: %s", e)
+
+    def _update_progress(self):
+        """检查进度，Ping和端口测试全部完成后结束测试
+
+        完成信号经由Qt队列连接送达主线程，计数器无需加锁；进度条由_flush_table
+        随定时器统一刷新，不在每个完成信号里重绘。
+        """
+        logger.debug("进度: %s/%s",
+                     self.ping_finished_count + self.port_finished_count,
+                     self.target_count * 2)
+
+        # 检查是否全部完成
+        if (self.ping_finished_count == self.target_count
+                and self.port_finished_count == self.target_count):
+            logger.debug("所有测试已完成，准备更新UI")
+            QTimer.singleShot(0, self._finalize_testing)
 
     def _finalize_testing(self):
         """最终完成测试处理"""
         try:
-            print(f"最终完成测试处理 called, 当前按钮文本: {self.run_btn.text()}")
+            # 刷新剩余结果后停止定时器
+            self._flush_timer.stop()
+            self._flush_table()
+
+            logger.debug("最终完成测试处理")
 
             # 确保在主线程执行UI更新
             if not sip.isdeleted(self.run_btn):
@@ -779,11 +1245,11 @@ class NetworkTool(QMainWindow):
             if not sip.isdeleted(self.status_label):
                 self.status_label.setText("测试完成")
 
-            print("UI状态已更新")
+            logger.debug("UI状态已更新")
             # 显示完成通知
             QMessageBox.information(self, "完成", "所有测试已完成!")
         except Exception as e:
-            print(f"最终处理错误: {str(e)}")
+            logger.warning("最终处理错误: %s", e)
 
     def _on_all_tests_finished(self):
         """所有测试完成处理"""
@@ -809,7 +1275,7 @@ class NetworkTool(QMainWindow):
 
     def export_results(self):
         """导出测试结果"""
-        if self.results_table.rowCount() == 0:
+        if self.results_model.rowCount() == 0:
             self.show_warning("没有可导出的结果")
             return
 
@@ -837,38 +1303,24 @@ class NetworkTool(QMainWindow):
 
     def _export_to_json(self, file_path):
         """将结果导出为JSON格式"""
-        results = []
-        for row in range(self.results_table.rowCount()):
-            result = {
-                "target": self.results_table.item(row, 0).text(),
-                "ping_latency": self.results_table.item(row, 1).text(),
-                "ping_loss": self.results_table.item(row, 2).text(),
-                "port": self.results_table.item(row, 3).text(),
-                "port_status": self.results_table.item(row, 4).text()
-            }
-            results.append(result)
+        columns = ResultsModel.COLUMNS
+        results = [dict(zip(columns, record)) for record in self.results_model.records()]
 
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(results, f, indent=4, ensure_ascii=False)
+        if orjson:
+            # orjson直接输出UTF-8字节
+            with open(file_path, 'wb') as f:
+                f.write(orjson.dumps(results))
+        else:
+            with open(file_path, 'w', encoding='utf-8') as f:
+                json.dump(results, f, ensure_ascii=False, separators=(',', ':'))
 
     def _export_to_csv(self, file_path):
         """将结果导出为CSV格式"""
         import csv
-        with open(file_path, 'w', encoding='utf-8', newline='') as f:
+        with open(file_path, 'w', encoding='utf-8', newline='', buffering=1 << 20) as f:
             writer = csv.writer(f)
-            # 写入表头
-            writer.writerow(["IP地址", "Ping延迟(ms)", "Ping丢包率(%)", "端口号", "端口状态"])
-
-            # 写入数据
-            for row in range(self.results_table.rowCount()):
-                row_data = [
-                    self.results_table.item(row, 0).text(),
-                    self.results_table.item(row, 1).text(),
-                    self.results_table.item(row, 2).text(),
-                    self.results_table.item(row, 3).text(),
-                    self.results_table.item(row, 4).text()
-                ]
-                writer.writerow(row_data)
+            writer.writerow(ResultsModel.HEADERS)
+            writer.writerows(self.results_model.records())
 
     def import_targets(self):
         """从文件导入目标地址"""
@@ -880,15 +1332,13 @@ class NetworkTool(QMainWindow):
             file_paths = file_dialog.selectedFiles()
             if file_paths:
                 try:
-                    with open(file_paths[0], 'r', encoding='utf-8') as f:
-                        targets = [line.strip() for line in f if line.strip()]
-                        self.ping_host.setText(",".join(targets))
+                    self.ping_host.setText(",".join(read_targets(file_paths[0])))
                 except Exception as e:
                     self.show_warning(f"无法读取文件: {str(e)}")
 
     def clear_results(self):
         """清空结果表格"""
-        self.results_table.setRowCount(0)
+        self.results_model.clear()
         self.status_label.setText("结果已清空")
 
     def show_warning(self, message):
@@ -897,7 +1347,7 @@ class NetworkTool(QMainWindow):
 
     def closeEvent(self, event):
         """窗口关闭事件处理"""
-        if len(self.test_workers) > 0:
+        if any(not f.done() for f in self._futures) or self._scanners_running():
             reply = QMessageBox.question(
                 self, "确认退出",
                 "测试正在进行中，确定要退出吗？",
@@ -908,9 +1358,11 @@ class NetworkTool(QMainWindow):
                 event.ignore()
                 return
 
-        # 停止所有测试
-        for target in list(self.test_workers.keys()):
-            self._stop_test(target)
+        # 停止所有测试：先置位取消事件，再等扫描线程和线程池任务自行退出
+        self._stop_event.set()
+        self.dns_cache.shutdown()
+        self._stop_scanners()
+        self._executor.shutdown(wait=True, cancel_futures=True)
         event.accept()
 
 
@@ -936,7 +1388,16 @@ class QIntValidator(QValidator):
 
 
 if __name__ == "__main__":
-    app = QApplication(sys.argv)
+    arg_parser = argparse.ArgumentParser(description="网速先知")
+    arg_parser.add_argument("--debug", action="store_true", help="输出调试日志")
+    args, qt_args = arg_parser.parse_known_args()
+
+    logging.basicConfig(format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    if args.debug:
+        logger.setLevel(logging.DEBUG)
+
+    # 其余参数交给Qt处理
+    app = QApplication(sys.argv[:1] + qt_args)
     app.setStyle('Fusion')
 
     icon = QIcon("statics/network.svg")
@@ -0,0 +1,29 @@
+"""目标地址解析：切分与去重须保持输入顺序"""
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("PyQt6")
+pytest.importorskip("pingparsing")
+
+# 主程序文件名为test.py，与标准库的test包同名，按路径单独加载
+_spec = importlib.util.spec_from_file_location(
+    "nettool", Path(__file__).resolve().parent.parent / "test.py"
+)
+nettool = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(nettool)
+
+
+def test_split_targets_keeps_first_occurrence_order():
+    assert nettool.split_targets("b,a;b\nc，d  a") == ["b", "a", "c", "d"]
+
+
+def test_split_targets_ignores_empty_tokens():
+    assert nettool.split_targets(" ,;，\n ") == []
+
+
+def test_read_targets_keeps_file_order(tmp_path):
+    path = tmp_path / "targets.txt"
+    path.write_text("b\n  a  \n\nb,c\nc d\n", encoding="utf-8")
+    assert nettool.read_targets(path) == ["b", "a", "c", "d"]